@@ -11,7 +11,9 @@ Terminology for annotations:
 - suffix:      i1  (or i1u1 or u1)
 """
 import dataclasses
+import functools
 import re
+import sys
 import typing as tg
 
 import qscript.icc as icc
@@ -24,27 +26,38 @@ AnnotationishMatches = tg.Tuple[OStr, OStr, OStr, OStr]
 
 @dataclasses.dataclass
 class CodeDef:
+    __slots__ = ('code', 'suffixdef', 'suffix_regexp', 'suffix_re', 'suffix_set')
     code: str
     suffixdef: str
     suffix_regexp: str
+    suffix_re: re.Pattern  # suffix_regexp, compiled
+    suffix_set: tg.Optional[tg.FrozenSet[str]]  # the allowed suffixes if suffixdef has only literals, else None
 
 
 class Codebook:
     CODEBOOK_PATH = 'codebook.md'  # in project rootdir
     CODEDEF_REGEXP = r"code `([\w-]+)((?::[^:`]+)+)?`"  # e.g. mycode:flag:i\d
+    CODEDEF_RE = re.compile(CODEDEF_REGEXP, flags=re.IGNORECASE)
     SUFFIX_SEPARATOR = ":"  # hardcoded in CODEDEF_REGEXP!
+    REGEXP_METACHARS_RE = re.compile(r"[\\.*+?\[\](){}^$|]")
     IGNORECODE = '-ignorediff'  # code that indicates not to report coding differences
     GARBAGE_CODES = ['cruft']
     NONETOPIC = 'none'  # pseudo-topic for codes that have no topic
-    codedefs: tg.Mapping[str, CodeDef]  # maps code to CodeDef
-
-    def __init__(self):
-        self.codedefs = self.codebook_contents(self.CODEBOOK_PATH)
+    REGEXPNAME_OF = dict(CODEDEF_RE='CODEDEF_REGEXP')  # for icc.compile_overridden_regexps()
 
     class CodingError(KeyError):
         """Code or suffix do not conform to codebook."""
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        icc.compile_overridden_regexps(cls, cls.REGEXPNAME_OF)
+
+    @functools.cached_property
+    def codedefs(self) -> tg.Mapping[str, CodeDef]:
+        """Maps code to CodeDef. codebook.md is read only when first needed."""
+        return self.codebook_contents(self.CODEBOOK_PATH)
+
     def exists(self, code: str) -> bool:
         return code in self.codedefs
 
@@ -54,11 +67,15 @@ class Codebook:
             return  # null suffixes are always OK
         if fullsuffixish.startswith(self.SUFFIX_SEPARATOR):
             fullsuffixish = fullsuffixish[1:]  # remove initial separator
+        codedef = self.codedefs[code]
         for suffix in fullsuffixish.split(self.SUFFIX_SEPARATOR):
-            allowed_pattern = self.codedefs[code].suffix_regexp
-            if not re.fullmatch(allowed_pattern, suffix):
+            if codedef.suffix_set is not None:
+                allowed = suffix in codedef.suffix_set
+            else:
+                allowed = codedef.suffix_re.fullmatch(suffix)
+            if not allowed:
                 msg = (f"suffix '{suffix}' not allowed for code '{code}': "
-                       f"{code}{self.SUFFIX_SEPARATOR}{self.codedefs[code].suffixdef}")
+                       f"{code}{self.SUFFIX_SEPARATOR}{codedef.suffixdef}")
                 raise self.CodingError(msg)
             # else all is fine and nothing happens
 
@@ -75,6 +92,7 @@ class Codebook:
         return code.startswith('h-')
 
     @classmethod
+    @functools.lru_cache(maxsize=None)  # the codes vocabulary is small
     def topic(cls, code: str) -> str:
         """Code group, for a coarser analysis. Result words should have a unique first letter."""
         if code.startswith('-'):
@@ -90,18 +108,24 @@ class Codebook:
     def codebook_contents(self, codebookfile: str) -> tg.Mapping[str, CodeDef]:
         with open(codebookfile, 'rt', encoding='utf8') as cb:
             codebook = cb.read()
-        matches = re.findall(self.CODEDEF_REGEXP, codebook, flags=re.IGNORECASE)
+        matches = self.CODEDEF_RE.findall(codebook)
         result = dict()
         for code, suffixdef in matches:
+            code = sys.intern(code)  # codes are compared and hashed a lot
             if suffixdef:
                 suffixdef = suffixdef[1:]  # remove initial separator
             suffix_regexp = suffixdef.replace(self.SUFFIX_SEPARATOR, '|')  
-            codedef = CodeDef(code, suffixdef, suffix_regexp)
+            if self.REGEXP_METACHARS_RE.search(suffixdef):
+                suffix_set = None  # needs the regexp
+            else:
+                suffix_set = frozenset(suffixdef.split(self.SUFFIX_SEPARATOR))  # e.g. flag:i1:i2
+            codedef = CodeDef(code, suffixdef, suffix_regexp, re.compile(suffix_regexp), suffix_set)
             result[code] = codedef
         return result
 
 
 class AnnotatedSentence:
+    __slots__ = ('sentence_idx', 'sentence', 'words', 'chars', 'syllables', 'fk_readability', 'annotation')
     sentence_idx: int
     sentence: str
     words: int
@@ -131,18 +155,19 @@ class AnnotatedSentence:
         score = 206.835 - 1.015*self.words - 84.6*self.syllables/self.words
         return round(score, 1)
 
-    @staticmethod
-    def syllablecount(word: str) -> int:
-        """near-correct (for English) heuristic count of syllables"""
+    VOWELS = "aeiouy"
+    VOWELS_TO_BLANKS = str.maketrans(VOWELS, " " * len(VOWELS))
+
+    @classmethod
+    def syllablecount(cls, word: str) -> int:
+        """near-correct (for English) heuristic count of syllables: the number of runs of vowels"""
         # word includes punctuation, which does not matter for our logic:
         if not word:
             return 0  # kludge: our word splitting produces empty first words
         word = word.lower()
-        vowels = "aeiouy"
-        result = 1 if word[0] in vowels else 0
-        for i in range(1, len(word)):
-            if word[i-1] not in vowels and word[i] in vowels:
-                result += 1
+        # runs of vowels and runs of non-vowels alternate, so count the latter (in C, not in Python):
+        nonvowel_runs = len(word.translate(cls.VOWELS_TO_BLANKS).split())
+        result = nonvowel_runs - 1 + (word[0] in cls.VOWELS) + (word[-1] in cls.VOWELS)
         if word.endswith("e"):
             result -= 1
         return result if result else 1
@@ -154,29 +179,47 @@ class Annotations:
     BARE_CODENAME_REGEXP = r"-?([\w-]+)(:[\w\d]*)?"
     EMPTY_ANNOTATION_REGEXP = r"\{\{\s*\}\}"
     LINE_AND_ANNOTATION_PAIR_REGEXP = r"(.*)\n(\{\{.*\}\})"
-    SENTENCE_AND_ANNOTATION_PAIR_REGEXP = r"(?<=.\n\n|\}\}\n)(.*?)\n(\{\{.*?\}\})"
+    SENTENCE_AND_ANNOTATION_PAIR_REGEXP = r"(?<=.\n\n|\}\}\n)(.*?)\n(\{\{.*?\}\})"  # use with re.DOTALL
+    # patterns are compiled once here, not looked up in the re module's cache on every call:
+    ANNOTATIONISH_RE = re.compile(ANNOTATIONISH_REGEXP)
+    ANNOTATION_CONTENT_RE = re.compile(ANNOTATION_CONTENT_REGEXP)
+    CODING_RE = re.compile(r"[\w-]+(?::[\w\d]+)*")  # a single well-formed coding
+    BARE_CODENAME_RE = re.compile(BARE_CODENAME_REGEXP)
+    EMPTY_ANNOTATION_RE = re.compile(EMPTY_ANNOTATION_REGEXP)
+    LINE_AND_ANNOTATION_PAIR_RE = re.compile(LINE_AND_ANNOTATION_PAIR_REGEXP)
+    SENTENCE_AND_ANNOTATION_PAIR_RE = re.compile(SENTENCE_AND_ANNOTATION_PAIR_REGEXP, flags=re.DOTALL)
+    REGEXPNAME_OF = dict(ANNOTATIONISH_RE='ANNOTATIONISH_REGEXP',  # for icc.compile_overridden_regexps()
+                         ANNOTATION_CONTENT_RE='ANNOTATION_CONTENT_REGEXP',
+                         BARE_CODENAME_RE='BARE_CODENAME_REGEXP',
+                         EMPTY_ANNOTATION_RE='EMPTY_ANNOTATION_REGEXP',
+                         LINE_AND_ANNOTATION_PAIR_RE='LINE_AND_ANNOTATION_PAIR_REGEXP',
+                         SENTENCE_AND_ANNOTATION_PAIR_RE='SENTENCE_AND_ANNOTATION_PAIR_REGEXP')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        icc.compile_overridden_regexps(cls, cls.REGEXPNAME_OF)
 
     def __init__(self):
         self.codebook = icc.init(Codebook)
+        # the same annotations recur across files and coders, so cache by annotation string:
+        self._codings_of_cache: tg.Dict[tg.Tuple[str, bool, bool], tg.FrozenSet[str]] = dict()
+        self._split_into_codings_cache: tg.Dict[str, tg.Sequence[Coding]] = dict()
 
     def find_all_annotationish(self, content: str) -> tg.Sequence[AnnotationishMatches]:
-        return re.findall(self.ANNOTATIONISH_REGEXP, content)
+        return self.ANNOTATIONISH_RE.findall(content)
 
     def find_all_line_and_annotation_pairs(self, content: str) -> tg.Sequence[tg.Tuple[str, str]]:
-        return re.findall(self.LINE_AND_ANNOTATION_PAIR_REGEXP, content)
+        return self.LINE_AND_ANNOTATION_PAIR_RE.findall(content)
 
     def find_all_sentence_and_annotation_pairs(self, content: str) -> tg.Sequence[AnnotatedSentence]:
-        result = []
-        i = 1
-        for sentence, annotation in re.findall(self.SENTENCE_AND_ANNOTATION_PAIR_REGEXP, 
-                                               content, flags=re.DOTALL):
-            result.append(AnnotatedSentence(i, sentence, annotation))
-            i += 1
-        return result
+        return [AnnotatedSentence(i, mm.group(1), mm.group(2))
+                for i, mm in enumerate(self.SENTENCE_AND_ANNOTATION_PAIR_RE.finditer(content), start=1)]
 
-    def bare_codename(self, coding: str) -> str:
+    @classmethod
+    @functools.lru_cache(maxsize=None)  # the codings vocabulary is small
+    def bare_codename(cls, coding: str) -> str:
         """Strips off leading dashes and trailing suffixes where present"""
-        mm = re.match(self.BARE_CODENAME_REGEXP, coding)
+        mm = cls.BARE_CODENAME_RE.match(coding)
         return mm.group(1)
 
     @staticmethod
@@ -191,23 +234,50 @@ class Annotations:
             return "{{}}" f" annotation must be alone on a line: '{other}'\n", None
         return None, valid
 
-    def codings_of(self, annotation: str, strip_suffixes=False, strip_subjective=False) -> tg.Set[str]:
+    def codings_of(self, annotation: str, strip_suffixes=False, strip_subjective=False) -> tg.FrozenSet[str]:
         """Return set of codings from annotation."""
-        result = set()
-        for code, csuffix in re.findall(self.ANNOTATION_CONTENT_REGEXP, annotation):
-            if strip_subjective and self.codebook.is_subjective_code(code):
-                continue  # do not include the subjective code
-            result.add(code + ("" if strip_suffixes else csuffix))
-        return result
+        key = (annotation, strip_suffixes, strip_subjective)
+        if key not in self._codings_of_cache:
+            self._codings_of_cache[key] = self._codings_of(annotation, strip_suffixes, strip_subjective)
+        return self._codings_of_cache[key]
+
+    def _codings_of(self, annotation: str, strip_suffixes: bool, strip_subjective: bool) -> tg.FrozenSet[str]:
+        codings = self._parse_codings(annotation.strip("{}"))
+        if strip_subjective:
+            is_subjective = self.codebook.is_subjective_code
+            codings = [(code, csuffix) for code, csuffix in codings if not is_subjective(code)]
+        if strip_suffixes:
+            return frozenset(code for code, csuffix in codings)
+        return frozenset(code + csuffix for code, csuffix in codings)
 
     def is_empty_annotation(self, annotation: str) -> bool:
-        return re.match(self.EMPTY_ANNOTATION_REGEXP, annotation) is not None
+        return self.EMPTY_ANNOTATION_RE.match(annotation) is not None
 
     def split_into_codings(self, annotation: str) -> tg.Sequence[Coding]:
-        """E.g. "{{a,b:i1}} --> [("a", ""), ("b", ":i1")]"""
-        annotation = annotation[2:-2]  # strip off the braces front and back
-        allcodes = re.findall(self.ANNOTATION_CONTENT_REGEXP, annotation)
-        return allcodes
+        """E.g. "{{a,b:i1}} --> (("a", ""), ("b", ":i1"))"""
+        if annotation not in self._split_into_codings_cache:
+            allcodes = self._parse_codings(annotation[2:-2])  # strip off the braces front and back
+            self._split_into_codings_cache[annotation] = tuple(allcodes)
+        return self._split_into_codings_cache[annotation]
+
+    def _parse_codings(self, codings: str) -> tg.List[Coding]:
+        """
+        Like ANNOTATION_CONTENT_RE.findall(codings), but with plain string operations,
+        which are much faster on the tiny, usually well-formed annotations.
+        Malformed codings, and all codings if a subclass has overridden the regexp, are left to the regexp.
+        """
+        if self.ANNOTATION_CONTENT_RE is not Annotations.ANNOTATION_CONTENT_RE:
+            return self.ANNOTATION_CONTENT_RE.findall(codings)
+        result = []
+        for coding in codings.split(','):
+            coding = coding.strip()
+            if not coding:
+                continue  # ignore empty codings, e.g. from a trailing comma
+            if not self.CODING_RE.fullmatch(coding):
+                return self.ANNOTATION_CONTENT_RE.findall(codings)
+            code, separator, fullsuffix = coding.partition(self.codebook.SUFFIX_SEPARATOR)
+            result.append((code, separator + fullsuffix))
+        return result
 
     def check_coding(self, code: str, cfullsuffix: tg.Optional[str]):
         """Check a single coding of code and perhaps cfullsuffix. Perhaps raise CodingError."""
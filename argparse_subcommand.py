@@ -27,14 +27,16 @@ It will execute importlib.import_module() on all modules mentioned in a scan() c
 Multiple calls to scan() are allowed, each can have one or more arguments.
 scan(..., strict=True) will exit when encountering a non-subcommand-module.
 Subcommands cannot be nested, there is only one level of subcommands.
+parser.scan_lazy(...) takes the same str arguments as scan(), but imports only the module of the
+subcommand named on the command line, which makes startup cheaper when there are many subcommands.
+If scan_lazy(..., argv=myargs) gets a list other than sys.argv[1:], call parse_args(myargs) as well.
 """
 
 
 import argparse
-import glob
 import importlib
 import os.path
-import re
+import pkgutil
 import sys
 import typing as tg
 import warnings
@@ -64,14 +66,10 @@ class ArgumentParser(argparse.ArgumentParser):
                 warnings.warn(f"scan() arguments must be str or module: {module} {type(module)} ignored.")
                 continue  # skip non-modules. 
             module_fullname = module.__name__  # includes superpackages
-            mm = re.search(r"\.?(\w+)$", module_fullname)  # match last component or entire name
-            module_name = mm.group(1)
-            subcommand_name = module_name.replace("_", "-")
+            module_name = module_fullname.rpartition(".")[2]  # last component or entire name
+            subcommand_name = self._subcommand_name(module_fullname)
             # ----- check for subcommand module:
-            required_attrs = (('meaning', str), 
-                              ('execute', functiontype), 
-                              ('add_arguments', functiontype))
-            if self._misses_any_of(module, required_attrs):
+            if not self._is_subcommand_module(module):
                 if strict:
                     print(f"{module_name} is not a proper subcommand module")
                     sys.exit(1)
@@ -83,26 +81,40 @@ class ArgumentParser(argparse.ArgumentParser):
                 print(f"'{module_fullname}' found")
             # ----- configure subcommand:
             self.subcommand_modules[subcommand_name] = module
-            aliases = module.aliases if hasattr(module, 'aliases') else []
+            aliases = getattr(module, 'aliases', ())
             for alias in aliases:
                 self.subcommand_modules[alias] = module
             subparser = self.subparsers.add_parser(subcommand_name, help=module.meaning,
                                                    aliases=aliases)
             module.add_arguments(subparser)
 
+    def scan_lazy(self, *modules: str, argv: tg.Optional[tg.Sequence[str]] = None,
+                  strict=False, trace=False):
+        """
+        Like scan(), but imports only the module of the subcommand named in argv (default: sys.argv[1:]).
+        parse_args() must then receive the same argv, because only that subcommand is known to the parser.
+        Falls back to scanning everything if that subcommand cannot be identified by module name
+        (e.g. for an alias or for a top-level --help).
+        """
+        if argv is None:
+            argv = sys.argv[1:]
+        modulename_of = dict()  # subcommand name -> module name
+        for module in modules:
+            if module.endswith(".*"):
+                for submodulename in self._submodulenames(module[:-2]):
+                    modulename_of[self._subcommand_name(submodulename)] = submodulename
+            else:
+                modulename_of[self._subcommand_name(module)] = module
+        selected = next((arg for arg in argv if not arg.startswith('-')), None)
+        if selected in modulename_of:
+            self.scan(modulename_of[selected], strict=strict, trace=trace)
+        else:
+            self.scan(*modules, strict=strict, trace=trace)
+
     def scan_submodules(self, modulename: str, strict=False, trace=False):
         if trace:
             print(f"scan_submodules('{modulename}')")
-        module = importlib.import_module(modulename)  # turn str into module
-        file_name = module.__file__
-        if file_name is None:
-            raise ValueError(f"'{modulename}' must lead to a directory with an __init__.py")
-        directory = os.path.dirname(file_name)
-        for pyfile in glob.glob(os.path.join(directory, "*.py")):
-            submodulebasename = os.path.basename(pyfile)[:-3]  # last component without suffix
-            if submodulebasename.startswith("_"):
-                continue  # skip __init__py and anything that would become an option name
-            submodulename = f"{modulename}.{submodulebasename}"
+        for submodulename in self._submodulenames(modulename):
             self.scan(submodulename, strict=strict, trace=trace)
 
     def execute_subcommand(self, args: tg.Optional[argparse.Namespace] = None):
@@ -111,9 +123,25 @@ class ArgumentParser(argparse.ArgumentParser):
         self.subcommand_modules[args.subcommand].execute(args)
 
     @staticmethod
-    def _misses_any_of(module: moduletype, required: tg.Sequence[tg.Tuple[str, type]]) -> bool:
-        for name, _type in required:
-            module_elem = getattr(module, name, None)
-            if not module_elem or not isinstance(module_elem, _type):
-                return True  # this is not a subcommand-shaped submodule
-        return False
+    def _submodulenames(modulename: str) -> tg.Generator[str, None, None]:
+        """Full names of the non-underscore modules in package modulename (which gets imported)."""
+        module = importlib.import_module(modulename)  # turn str into module
+        file_name = module.__file__
+        if file_name is None:
+            raise ValueError(f"'{modulename}' must lead to a directory with an __init__.py")
+        directory = os.path.dirname(file_name)
+        for _finder, submodulebasename, ispkg in pkgutil.iter_modules([directory]):
+            if ispkg or submodulebasename.startswith("_"):
+                continue  # skip subpackages and anything that would become an option name
+            yield f"{modulename}.{submodulebasename}"
+
+    @staticmethod
+    def _subcommand_name(module_fullname: str) -> str:
+        return module_fullname.rpartition(".")[2].replace("_", "-")
+
+    @staticmethod
+    def _is_subcommand_module(module: moduletype) -> bool:
+        meaning = getattr(module, 'meaning', None)
+        return (isinstance(meaning, str) and bool(meaning)
+                and isinstance(getattr(module, 'execute', None), functiontype)
+                and isinstance(getattr(module, 'add_arguments', None), functiontype))
@@ -1,3 +1,5 @@
+import concurrent.futures
+import itertools
 import sys
 import typing as tg
 
@@ -27,50 +29,55 @@ def execute(args: qscript.Namespace):
     annots = icc.init(annot.Annotations)
     what = qscript.metadata.WhoWhat(args.workdir)
     errors: int = 0
-    for coder in sorted(what.coders):
-        print(f"\n#################### {coder}'s: ####################\n")
-        for file in what.files_of(coder):
-            errors += report_errors(file, coder, what.blockname(file), annots)
+    with concurrent.futures.ThreadPoolExecutor() as executor:  # overlap reading the many files
+        for coder in what.sorted_coders:
+            print(f"\n#################### {coder}'s: ####################\n")
+            files = list(what.files_of(coder))
+            for file, file_errors in zip(files, executor.map(find_errors, files, itertools.repeat(annots))):
+                print_errors(file, coder, what.blockname(file), file_errors)
+                errors += len(file_errors)
     errors = min(errors, 255) # avoid overflow
     sys.exit(errors)  # 0 if no errors, number of errors otherwise
 
 
-def report_errors(file: str, coder: str, block: str, annots: annot.Annotations) -> int:
-    def report():
-        if errors:
-            print(f"---- {color.BLUE}{file}{color.RESET}  ({coder}, Block {block}):\n" + '\n'.join(errors))
+def print_errors(file: str, coder: str, block: str, errors: tg.Sequence[str]):
+    if errors:
+        print(f"---- {color.BLUE}{file}{color.RESET}  ({coder}, Block {block}):\n" + '\n'.join(errors))
+
+
+def find_errors(file: str, annots: annot.Annotations) -> tg.List[str]:
+    """Error messages for file. Does not print, so it can run in a worker thread."""
     with open(file, 'rt', encoding='utf8') as f:
         content = f.read()
     # ----- check annotation-ish stuff:
+    RED, RESET = color.RED, color.RESET
     errors = []
     for matches in annots.find_all_annotationish(content):
         msg, annotation = annots.check_annotationish(matches)
         if msg and not annotation:
-            errors.append(f"{color.RED}{msg}{color.RESET}")
+            errors.append(f"{RED}{msg}{RESET}")
         elif annotation and not msg:
             errors.extend(report_errors_within_braces(annotation, annots))
         else:
-            assert False, "WTF? This was supposed to never happen!"
+            raise RuntimeError("check_annotationish() must return either a message or an annotation")
         if len(errors) > 3:  # don't overwhelm with too many messages
             errors.append("too many problems in this file, stopping.\n")
-            report()
-            return len(errors)
-    # ----- finish:
-    report()
-    return len(errors)
+            break
+    return errors
 
 
 def report_errors_within_braces(annotation: str, annots: annot.Annotations) -> tg.Sequence[str]:
+    RED, RESET = color.RED, color.RESET
     errors = []
     codings = annots.split_into_codings(annotation)
     for code, fullsuffix in codings:
         try:
             annots.check_coding(code, fullsuffix)
         except annots.codebook.CodingError as exc:
-            errors.append(f"{annotation}\n{color.RED}{exc.args[0]}{color.RESET}")
+            errors.append(f"{annotation}\n{RED}{exc.args[0]}{RESET}")
     if not errors:
         try:
             annots.check_codings(codings)
         except annots.codebook.CodingError as exc:
-            errors.append(f"{annotation}\n{color.RED}{exc.args[0]}{color.RESET}")
+            errors.append(f"{annotation}\n{RED}{exc.args[0]}{RESET}")
     return errors
\ No newline at end of file
@@ -15,6 +15,15 @@ def add_arguments(subparser: qscript.ArgumentParser):
                            help="Directory where sample-who-what.txt lives")
 
 
+class Progress:
+    """Number of coded pairs and the set of blocks they come from."""
+    __slots__ = ('pair_count', 'blocks')
+
+    def __init__(self):
+        self.pair_count = 0
+        self.blocks = set()
+
+
 def execute(args: qscript.Namespace):
     print("=================================")
     print("=== Report of Coding Progress ===")
@@ -24,39 +33,38 @@ def execute(args: qscript.Namespace):
     report_data = {
         'total_pairs': 0,
         'blocks': set(),
-        'pairs': defaultdict(lambda: {'pair_count': 0, 'blocks': set()}),
+        'pairs': defaultdict(Progress),
     }
     for pair in what.pairs:
-        coder_tuple = tuple(sorted([pair[1], pair[3]]))
+        coder1, coder2 = pair[1], pair[3]
+        coder_tuple = (coder1, coder2) if coder1 <= coder2 else (coder2, coder1)
         block_name = what.blockname(pair[0])
         # Count total abstracts
         report_data['total_pairs'] += 1
         # Track unique blocks
         report_data['blocks'].add(block_name)
         # Count pairs
-        report_data['pairs'][coder_tuple]['pair_count'] += 1
-        report_data['pairs'][coder_tuple]['blocks'].add(block_name)
+        pair_data = report_data['pairs'][coder_tuple]
+        pair_data.pair_count += 1
+        pair_data.blocks.add(block_name)
 
     # ----- display report data:
     print(f"\nCoded Units: {report_data['total_pairs']} ({len(report_data['blocks'])} blocks)")
     print('\nCoding Pairs:')
-    name_pad = max([len(name) for name in what.coders])
-    sorted_pairs = dict(sorted(report_data['pairs'].items(),
-                               key=lambda item: item[1]['pair_count'],
-                               reverse=True))
-    for pair, data in sorted_pairs.items():
-        print(f"{pair[0]: <{name_pad}} & {pair[1]: <{name_pad}} {data['pair_count']} ({len(data['blocks'])} blocks)")
+    name_pad = max(map(len, what.coders))
+    sorted_pairs = sorted(report_data['pairs'].items(),
+                          key=lambda item: item[1].pair_count,
+                          reverse=True)
+    for pair, data in sorted_pairs:
+        print(f"{pair[0]: <{name_pad}} & {pair[1]: <{name_pad}} {data.pair_count} ({len(data.blocks)} blocks)")
     print('\nCoding Individuals:')
-    coder_reports = defaultdict(lambda: {'pair_count': 0, 'blocks': set()})
-    for coder in sorted(what.coders):
-        for pair, data in sorted_pairs.items():
-            if coder not in pair:
-                continue
-            coder_reports[coder]['pair_count'] += data['pair_count']
-            coder_reports[coder]['blocks'].update(data['blocks'])
-    sorted_coder_reports = dict(sorted(coder_reports.items(),
-                                       key=lambda item: item[1]['pair_count'],
-                                       reverse=True)).items()
+    coder_reports = defaultdict(Progress)
+    for pair, data in sorted_pairs:
+        for coder in set(pair):  # set: count a pair only once even if it has the same coder twice
+            coder_reports[coder].pair_count += data.pair_count
+            coder_reports[coder].blocks.update(data.blocks)
+    sorted_coder_reports = sorted(coder_reports.items(),
+                                  key=lambda item: (-item[1].pair_count, item[0]))
     for coder, coder_report in sorted_coder_reports:
-        print(f"{coder: <{name_pad}} {coder_report['pair_count']} ({len(coder_report['blocks'])} blocks)")
+        print(f"{coder: <{name_pad}} {coder_report.pair_count} ({len(coder_report.blocks)} blocks)")
     print('')
@@ -1,4 +1,7 @@
+import concurrent.futures
 import dataclasses
+import itertools
+import pathlib
 import sys
 import typing as tg
 
@@ -33,31 +36,45 @@ def execute(args: qscript.Namespace):
     print("=========================================================================================")
     print("=== check pairs of files (consult with your fellow coder except for obvious mistakes) ===")
     print("=========================================================================================")
-    for coder in sorted(what.coders):
-        if args.onlyfor and args.onlyfor != coder:
-            continue  # suppress this block of messages
-        print(f"\n\n#################### {coder}'s: ####################\n")
-        for file1, coder1, file2, coder2 in what.pairs:
-            if coder in (coder1, coder2):
-                ctx = ComparatorContext(file1, coder1, file2, coder2, what.blockname(file1))
-                comparator.compare_files(ctx, args.maxcountdiff, annots)
+    with concurrent.futures.ThreadPoolExecutor() as executor:  # overlap reading the many files
+        for coder in what.sorted_coders:
+            if args.onlyfor and args.onlyfor != coder:
+                continue  # suppress this block of messages
+            print(f"\n\n#################### {coder}'s: ####################\n")
+            ctxs = [ComparatorContext(file1, coder1, file2, coder2, what.blockname(file1))
+                    for file1, coder1, file2, coder2 in what.pairs_of(coder)]
+            parsed = executor.map(comparator.parse_files, ctxs, itertools.repeat(annots))
+            for ctx, (sa_pairs1, sa_pairs2) in zip(ctxs, parsed):
+                comparator.compare_codings2(ctx, sa_pairs1, sa_pairs2, args.maxcountdiff, annots)
     sys.exit(comparator.get_exitcode())  # 0 if no errors, number of errors otherwise
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class ComparatorContext:
+    __slots__ = ('file1', 'name1', 'file2', 'name2', 'block',
+                 'tail1', 'tail2', 'ok_tail1', 'ok_tail2')  # tails are not fields, see __post_init__
     file1: str
     name1: str
     file2: str
     name2: str
     block: str
 
+    def __post_init__(self):
+        """Precompute the message endings used for every reported line."""
+        setattr_ = object.__setattr__  # we are frozen
+        setattr_(self, 'tail1', f"{color.RESET}  ({self.name1})")
+        setattr_(self, 'tail2', f"{color.RESET}  ({self.name2})")
+        setattr_(self, 'ok_tail1', f"{color.RESET}  -OK- ({self.name1})")
+        setattr_(self, 'ok_tail2', f"{color.RESET}  -OK- ({self.name2})")
+
 
 class CodingsComparator:
     def __init__(self):
         self.msgcount = 0
         self.lastmsg = ""   # message type in last header
         self.extra_line_done = True  # whether one more sentence after previous problem has been shown already
+        self.outlines: tg.List[str] = []  # output of the current file pair, written in one go by _flush()
+        self.parsed: tg.Dict[str, tg.Sequence[annot.AnnotatedSentence]] = {}  # each file is in several pairs
 
     def get_exitcode(self) -> int:
         msgcount = self.msgcount // 2  # we counted unordered pairs, so we have to undo the double counting
@@ -65,13 +82,21 @@ class CodingsComparator:
         
     def compare_files(self, ctx: ComparatorContext, 
                       maxcountdiff: int, annots: annot.Annotations):
-        with open(ctx.file1, 'r', encoding='utf8') as f1:
-            content1 = f1.read()
-        with open(ctx.file2, 'r', encoding='utf8') as f2:
-            content2 = f2.read()
-        sa_pairs1 = annots.find_all_sentence_and_annotation_pairs(content1)  # list of (previous sentence, annotation)
-        sa_pairs2 = annots.find_all_sentence_and_annotation_pairs(content2)  # list of (previous sentence, annotation)
+        sa_pairs1, sa_pairs2 = self.parse_files(ctx, annots)
         self.compare_codings2(ctx, sa_pairs1, sa_pairs2, maxcountdiff, annots)
+
+    def parse_files(self, ctx: ComparatorContext, annots: annot.Annotations
+                    ) -> tg.Tuple[tg.Sequence[annot.AnnotatedSentence], tg.Sequence[annot.AnnotatedSentence]]:
+        """Read and parse both files. Prints nothing, so it can run in a worker thread."""
+        return self._parse_file(ctx.file1, annots), self._parse_file(ctx.file2, annots)
+
+    def _parse_file(self, file: str, annots: annot.Annotations) -> tg.Sequence[annot.AnnotatedSentence]:
+        sa_pairs = self.parsed.get(file)
+        if sa_pairs is None:
+            content = pathlib.Path(file).read_text(encoding='utf8')
+            sa_pairs = annots.find_all_sentence_and_annotation_pairs(content)  # list of (previous sentence, annotation)
+            self.parsed[file] = sa_pairs
+        return sa_pairs
     
     def compare_codings2(self, ctx: ComparatorContext, 
                          annotated_sentences1: tg.Sequence[annot.AnnotatedSentence],
@@ -81,75 +106,78 @@ class CodingsComparator:
         self.extra_line_done = True  # whether one more sentence after previous problem has been shown already
     
         for as1, as2 in zip(annotated_sentences1, annotated_sentences2):
+            ann1, ann2 = as1.annotation, as2.annotation
             # ----- check for non-parallel codings:
             if as1.sentence != as2.sentence:
                 should_msg = "Annotations should be at parallel points in the files"
                 self._printmsg(ctx, f"{should_msg}, but are at different points here:",
                                self._of_1(ctx, f"\"{as1.sentence}\""), self._of_2(ctx, f"\"{as2.sentence}\""))
                 break
+            numbered = self._numbered_sentence(as1)
             # ----- check for incomplete annotation:
-            if annots.is_empty_annotation(as1.annotation) or annots.is_empty_annotation(as2.annotation):
+            if annots.is_empty_annotation(ann1) or annots.is_empty_annotation(ann2):
                 self._printmsg(ctx, "Incomplete annotation found, skipping rest of this file pair:",
-                               self._numbered_sentence(as1), 
-                               self._of_1(ctx, as1.annotation), self._of_2(ctx, as2.annotation))
+                               numbered, self._of_1(ctx, ann1), self._of_2(ctx, ann2))
                 break
             # ----- check for double IGNORE:
-            set1 = annots.codings_of(as1.annotation, strip_suffixes=True, strip_subjective=True)
-            set2 = annots.codings_of(as2.annotation, strip_suffixes=True, strip_subjective=True)
+            set1 = annots.codings_of(ann1, strip_suffixes=True, strip_subjective=True)
+            set2 = annots.codings_of(ann2, strip_suffixes=True, strip_subjective=True)
             if IGNORE in set1 and IGNORE in set2:
                 self._printmsg(ctx, f"Code '{IGNORE}' should only appear in one coding, never in both as it does here:",
-                               self._numbered_sentence(as1), 
-                               self._of_1(ctx, as1.annotation), self._of_2(ctx, as2.annotation))
+                               numbered, self._of_1(ctx, ann1), self._of_2(ctx, ann2))
                 continue
             # ----- check for IGNORE:
-            if IGNORE in (set1 | set2):
+            if IGNORE in set1 or IGNORE in set2:
                 continue  # do not report possible discrepancies
                 # we do not check for superfluous IGNORE, because that does not scale for 
                 # more than 2 columns as in prestudy2
             # ----- check for code discrepancies:
             if set1 != set2:  # code sets are different
                 self._printmsg(ctx, f"The sets of codes applied are different, please check:",
-                               self._numbered_sentence(as1), 
-                               self._of_1(ctx, as1.annotation), self._of_2(ctx, as2.annotation))
+                               numbered, self._of_1(ctx, ann1), self._of_2(ctx, ann2))
                 continue
             # ----- check for count discrepancies:
             old_msgcount = self.msgcount
             self.check_suffixes(annots, as1, as2, ctx, maxcountdiff)
             if self.msgcount - old_msgcount > 0:
                 continue
-            self._printextra(self._numbered_sentence(as1), 
-                             self._of_1_ok(ctx, as1.annotation), self._of_2_ok(ctx, as2.annotation))
+            self._printextra(numbered, self._of_1_ok(ctx, ann1), self._of_2_ok(ctx, ann2))
+        self._flush()
 
     def _printmsg(self, ctx: ComparatorContext, msg: str, *items: tg.Sequence[str]):
         """Show sentence with a problem. Suppress header if same as previous."""
         if msg != self.lastmsg:
-            print(f"\n{color.YELLOW}##### {msg}{color.RESET}")
-            print(f"{color.BLUE}{ctx.file1}{color.RESET}  ({ctx.name1}, Block {ctx.block})")
-            print(f"{color.BLUE}{ctx.file2}{color.RESET}  ({ctx.name2}, Block {ctx.block})")
+            self.outlines.append(f"\n{color.YELLOW}##### {msg}{color.RESET}")
+            self.outlines.append(f"{color.BLUE}{ctx.file1}{color.RESET}  ({ctx.name1}, Block {ctx.block})")
+            self.outlines.append(f"{color.BLUE}{ctx.file2}{color.RESET}  ({ctx.name2}, Block {ctx.block})")
             self.lastmsg = msg
-        for item in items:
-            print(item)
+        self.outlines.extend(items)
         self.extra_line_done = False
         self.msgcount += 1
 
     def _printextra(self, *items: tg.Sequence[str]):
         if self.extra_line_done:
             return  # do _printextra only once between any two problems
-        for item in items:
-            print(item)
+        self.outlines.extend(items)
         self.extra_line_done = True
 
+    def _flush(self):
+        if self.outlines:
+            self.outlines.append("")  # for the final newline
+            sys.stdout.write("\n".join(self.outlines))
+            self.outlines.clear()
+
     def _numbered_sentence(self, ann_sent: annot.AnnotatedSentence) -> str:
         return f"[{ann_sent.sentence_idx}] {color.BOLD}{ann_sent.sentence}{color.RESET}"
 
     def _of_1(self, ctx: ComparatorContext, msg: str) -> str:
-        return f"{color.RED}{msg}{color.RESET}  ({ctx.name1})"
+        return color.RED + msg + ctx.tail1
 
     def _of_2(self, ctx: ComparatorContext, msg: str) -> str:
-        return f"{color.RED}{msg}{color.RESET}  ({ctx.name2})"
+        return color.RED + msg + ctx.tail2
 
     def _of_1_ok(self, ctx: ComparatorContext, msg: str) -> str:
-        return f"{color.GREEN}{msg}{color.RESET}  -OK- ({ctx.name1})"
+        return color.GREEN + msg + ctx.ok_tail1
 
     def _of_2_ok(self, ctx: ComparatorContext, msg: str) -> str:
-        return f"{color.GREEN}{msg}{color.RESET}  -OK- ({ctx.name2})"
+        return color.GREEN + msg + ctx.ok_tail2
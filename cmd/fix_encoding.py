@@ -1,3 +1,5 @@
+import pathlib
+
 import qscript
 
 meaning = """Makes each file conform to UTF-8 encoding.
@@ -20,12 +22,11 @@ def execute(args: qscript.Namespace):
 
 def check_and_perhaps_rewrite(file: str):
     print(f"reading '{file}'")
+    raw = pathlib.Path(file).read_bytes()  # read only once, decode in memory
     try:
-        with open(file, 'rt', encoding='utf-8') as f:
-            f.read()  # just read. The actual data is not needed.
+        raw.decode(encoding='utf-8')  # just decode. The actual data is not needed.
     except UnicodeDecodeError as exc:
         print(f"==> rewriting '{file}' from assumed Windows-1252 to UTF-8")
-        with open(file, 'rb') as f:
-            content = f.read().decode(encoding='windows-1252', errors='replace')
+        content = raw.decode(encoding='windows-1252', errors='replace')
         with open(file, 'wb') as f:
             f.write(content.encode(encoding='utf-8', errors='replace'))  # put '?' for unknown chars
@@ -1,3 +1,4 @@
+import itertools
 import json
 import os.path
 import random
@@ -23,8 +24,8 @@ def add_arguments(subparser: qscript.ArgumentParser):
 def execute(args: qscript.Namespace):
     pop = Population(args.volumes)
     sample = Sample(args.blocksize)
-    for i in range(args.size):
-        sample.add(pop.draw1())
+    for elem in pop.draw(args.size):
+        sample.add(elem)
     if os.path.exists(f"{args.to}/sample.list"):
         print(f"{args.to}/sample.list already exists. I will not overwrite it. Exiting.")
         return
@@ -41,18 +42,24 @@ class Population:
             my_subpopulation = self.subpopulation(volume)
             random.shuffle(my_subpopulation)
             self.subpopulations.append(my_subpopulation)
-        self.next_subpopI = 0  # where to attempt to draw from next time
+        self._drawing = self._round_robin()  # the draws, produced lazily
 
-    def draw1(self) -> str:
-        anything_left = sum(map(len, self.subpopulations)) > 0
-        if not anything_left:
+    def draw(self, n: int) -> tg.List[str]:
+        drawn = list(itertools.islice(self._drawing, n))
+        if len(drawn) < n:
             raise ValueError("All subpopulations have run dry. Nothing left to draw from.")
-        next = self.next_subpopI  # remember where we are and
-        self.next_subpopI = (next + 1) % len(self.subpopulations)  # move on by 1
-        if len(self.subpopulations[next]) > 0:
-            return self.subpopulations[next].pop()  # return last element and remove it
-        else:
-            return self.draw1()  # return from next subpopulaation, because the current one is empty
+        return drawn
+
+    def draw1(self) -> str:
+        return self.draw(1)[0]
+
+    def _round_robin(self) -> tg.Generator[str, None, None]:
+        """One element from each subpopulation in turn, skipping those that have run dry."""
+        rounds = itertools.zip_longest(*(reversed(subpop) for subpop in self.subpopulations))
+        for round_ in rounds:
+            for elem in round_:
+                if elem is not None:  # None is zip_longest's filler for a dry subpopulation
+                    yield elem
 
     @staticmethod
     def subpopulation(volumedir: str) -> tg.List[str]:
@@ -66,10 +73,10 @@ class Sample:
     """
     def __init__(self, blocksize: int):
         self.blocksize = blocksize
-        self._elems = []
+        self._elems = []  # type: tg.List[tg.Tuple[str, str]]  # (entry, citekey)
 
     def add(self, elem: str):
-        self._elems.append(elem)
+        self._elems.append((elem, qscript.metadata.citekey(elem)))
         if len(self._elems) % self.blocksize == 0:
             self.shuffle_last(self.blocksize)
             # an incomplete last block will not be shuffled automatically, a negligible problem.
@@ -78,18 +85,16 @@ class Sample:
         """randomize order of the last n elems"""
         N = len(self._elems)
         lastblock = self._elems[(N - n):N]
-        lastblock = random.sample(lastblock, n)
+        random.shuffle(lastblock)  # shuffles the copy, which is then assigned back
         self._elems[(N - n):N] = lastblock
 
     @property
-    def entries(self) -> tg.Generator[str, None, None]:
-        for elem in self._elems:
-            yield elem
+    def entries(self) -> tg.List[str]:
+        return [elem for elem, citekey in self._elems]
 
     @property
-    def citekeys(self):
-        for elem in self._elems:
-            yield qscript.metadata.citekey(elem)
+    def citekeys(self) -> tg.List[str]:
+        return [citekey for elem, citekey in self._elems]
 
 
 def volumename(volumedir: str) -> str:
@@ -116,8 +121,7 @@ def write_titles(to: str, sample: Sample, volumedirs: tg.Sequence[str]):
             for entry in json.load(md)['corpus_metadata']:
                 alltitles[entry['identifier']] = entry['title']  # make titles accessible by citekey
     titles = dict()
-    for entry in sample.entries:
-        volumedir, citekey = qscript.metadata.split_entry(entry)
+    for citekey in sample.citekeys:
         titles[citekey] = alltitles[citekey]
     filename = f"{to}/sample-titles.json"
     with open(filename, 'w', encoding='utf8') as j:
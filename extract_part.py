@@ -1,5 +1,6 @@
 """framework for the concrete parts extractors extract_abs, extract_concl."""
 import argparse
+import concurrent.futures
 import os.path
 import re
 import typing as tg
@@ -8,6 +9,8 @@ import qscript.metadata
 
 LayoutDescriptor = tg.Mapping[str, tg.Any]  # fixed structure per extraction task
 Extractor = tg.Callable[[LayoutDescriptor, str, argparse.Namespace], str]  # returns text extracted from PDF
+VOLUMENAME_RE = re.compile(r"(.+/)?([A-Za-z]+)-(\d\d\d\d)")  # {perhaps_path}/{name}-{year}
+READABLE_TABLE = str.maketrans({"ﬁ": "fi", "ﬂ": "fl"})  # for more_readable()
 
 
 def is_icse_in_year(volume: str, years: tg.Set[int]) -> bool:
@@ -42,16 +45,36 @@ def decide_layouttype(layouttypes: tg.Mapping[str, LayoutDescriptor], entry: qsc
 
 def extract_parts(extractor: Extractor, 
                   layouttypes: dict, layouttype: str, helper: argparse.Namespace,
-                  outputdir: str, inputfile: str):
+                  outputdir: str, inputfile: str, jobs: int = 1):
+    """
+    Extract from a single .pdf file or from all files named in a .list file.
+    For a .list, jobs > 1 extracts in that many worker processes,
+    which requires extractor, helper, and the layouts to be picklable (e.g. no lambdas).
+    """
     if inputfile.endswith('.pdf'):
         layout = layouttypes[layouttype] if layouttype else decide_layouttype(layouttypes, inputfile)
         extract_part(extractor, layout, inputfile, helper, outputdir)
     elif inputfile.endswith('.list'):
-        with open(inputfile, mode='rt', encoding="utf8") as f:
-            inputstring = f.read()
-        for inputfile in inputstring.split('\n'):
-            extract_part(extractor, decide_layouttype(layouttypes, inputfile), inputfile, helper,
-                         outputdir)
+        layouts = dict()  # volume -> LayoutDescriptor; all files of a volume share its layout
+        tasks = []  # (layout, pdffile)
+        existing = {direntry.name for direntry in os.scandir(outputdir)}
+        for pdffile in qscript.metadata.iter_list(inputfile):
+            if _outputfilename(pdffile) in existing:
+                print(f"#### '{outputdir}/{_outputfilename(pdffile)}' exists!. SKIPPED.")
+                continue
+            volume = qscript.metadata.volume(pdffile)
+            if volume not in layouts:
+                layouts[volume] = decide_layouttype(layouttypes, pdffile)
+            tasks.append((layouts[volume], pdffile))
+        if jobs <= 1:
+            for layout, pdffile in tasks:
+                extract_part(extractor, layout, pdffile, helper, outputdir)
+            return
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:  # PDF extraction is CPU-heavy
+            futures = [executor.submit(extract_part, extractor, layout, pdffile, helper, outputdir)
+                       for layout, pdffile in tasks]
+            for future in futures:
+                future.result()  # re-raise any exception from the workers
     else:
         print(f"'{inputfile}': unknown input file type; must be .pdf or .list")
 
@@ -60,9 +83,7 @@ def extract_part(extractor: Extractor,
                  layouttype: LayoutDescriptor, pdffilepath: str, helper: argparse.Namespace,
                  outputdir: str):
     # ----- skip existing:
-    pdffile = os.path.basename(pdffilepath)
-    basename, suffix = os.path.splitext(pdffile)
-    outputpathname = f"{outputdir}/{basename}.txt"
+    outputpathname = f"{outputdir}/{_outputfilename(pdffilepath)}"
     if os.path.exists(outputpathname):
         print(f"#### '{outputpathname}' exists!. SKIPPED.")
         return
@@ -74,12 +95,14 @@ def extract_part(extractor: Extractor,
         f.write(abstract)
 
 
+def _outputfilename(pdffilepath: str) -> str:
+    basename, suffix = os.path.splitext(os.path.basename(pdffilepath))
+    return f"{basename}.txt"
+
+
 def more_readable(txt: str) -> str:
     """Replace some special chars (such as ligatures) by more readable equivalents."""
-    txt2 = txt
-    txt2 = txt2.replace("ﬁ", "fi")
-    txt2 = txt2.replace("ﬂ", "fl")
-    return txt2
+    return txt.translate(READABLE_TABLE)
 
 
 def remove_stuff(txt: str, removelist: tg.Sequence[str]) -> str:
@@ -91,7 +114,6 @@ def remove_stuff(txt: str, removelist: tg.Sequence[str]) -> str:
 
 
 def volume_as_path_name_year(volumepath: str) -> tg.Tuple[str, str, int]:
-    volumename_regexp = r"(.+/)?([A-Za-z]+)-(\d\d\d\d)"  # {perhaps_path}/{name}-{year}
-    mm = re.fullmatch(volumename_regexp, volumepath) 
+    mm = VOLUMENAME_RE.fullmatch(volumepath)
     path, name, year = (mm.group(1), mm.group(2), int(mm.group(3)))
     return path, name, year
\ No newline at end of file
@@ -1,5 +1,6 @@
 """super-simple inversion of control container; see pymple for something a bit more powerful."""
 
+import re
 import typing as tg
 
 _iccdict = dict()  # maps abstract type to implementation type
@@ -14,14 +15,23 @@ def register_class(abstractclass: type, implemclass: type):
 
 
 def get(abstractclass: type) -> type:
-    _assert_exists(abstractclass)
-    return _iccdict[abstractclass]
+    try:
+        return _iccdict[abstractclass]
+    except KeyError:
+        raise IccKeyError(f"no implementation is known for abstract class '{abstractclass}'") from None
 
 
 def init(abstractclass: type, *initargs, **initkwargs) -> tg.Any:
     return get(abstractclass)(*initargs, **initkwargs)  # call constructor
 
 
-def _assert_exists(abstractclass):
-    if abstractclass not in _iccdict:
-        raise IccKeyError(f"no implementation is known for abstract class '{abstractclass}'")
+def compile_overridden_regexps(cls: type, regexpname_of: tg.Mapping[str, str]):
+    """
+    For use in __init_subclass__ of classes whose implementation subclasses may override regexp strings:
+    recompile each pattern attribute of cls (mapped to the name of its regexp string attribute)
+    if the subclass has overridden the regexp string but not the pattern.
+    """
+    for patternname, regexpname in regexpname_of.items():
+        pattern, regexp = getattr(cls, patternname), getattr(cls, regexpname)
+        if patternname not in cls.__dict__ and pattern.pattern != regexp:
+            setattr(cls, patternname, re.compile(regexp, flags=pattern.flags))
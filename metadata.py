@@ -1,12 +1,17 @@
 """Reading and a little writing the various metadata files."""
+import functools
 import glob
 import os.path
 import re
 import typing as tg
 
+import qscript.icc as icc
+
 Entry = str  # Pseudo type for strings of form "mypath/EMSE-2021/AbuDab21.pdf"
 Filepair = tg.Tuple[str, str, str, str]  # (file1, coder1, file2, coder2)
 
+ENTRY_PARTS_RE = re.compile(r"([^/]+)/([^/]+)\.pdf$")  # e.g. volumes/EMSE-2021/AbuDab21.pdf
+
 
 def citekey(list_line: Entry) -> str:
     """From a line like EMSE-2021/AbuDab21.pdf return AbuDab21"""
@@ -15,7 +20,7 @@ def citekey(list_line: Entry) -> str:
 
 def split_entry(list_line: Entry) -> tg.Tuple[str, str]:
     """From a line like volumes/EMSE-2021/AbuDab21.pdf return its semantic parts EMSE-2021 and AbuDab21"""
-    mm = re.search(r"([^/]+)/([^/]+)\.pdf$", list_line)
+    mm = ENTRY_PARTS_RE.search(list_line)
     assert mm
     return mm.group(1), mm.group(2)
 
@@ -26,22 +31,33 @@ def volume(list_line: Entry) -> str:
 
 
 def read_list(filename: str) -> tg.List[Entry]:
+    return list(iter_list(filename))
+
+
+def iter_list(filename: str) -> tg.Generator[Entry, None, None]:
+    """The entries of a .list file, one per line; blank lines are skipped."""
     with open(filename, 'rt', encoding='utf-8') as lst:
-        mylist = lst.read().split('\n')
-        mylist.pop()  # file ends with \n, so last item is empty
-    return mylist
+        for line in lst:
+            if line.strip():
+                yield line.rstrip('\n')
 
 
 def write_list(to: str, entries: tg.Iterator[Entry]):
     with open(to, 'w', encoding='utf8') as lst:
-        for elem in entries:
-            lst.write(f"{elem}\n")
+        lst.write("".join(f"{elem}\n" for elem in entries))
 
 
 class Venue:
     """Understands sample.list and can determine which venue or volume a citekey belongs to."""
     FILENAME = "sample.list"
     ENTRY_REGEXP = r"(\w+)-(\d+)/([\w-]+)\."  # e.g. TSE-2021/LiuKimBis21.pdf
+    ENTRY_RE = re.compile(ENTRY_REGEXP)
+    YEAR_RE = re.compile(r"20\d\d")
+    REGEXPNAME_OF = dict(ENTRY_RE='ENTRY_REGEXP')  # for icc.compile_overridden_regexps()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        icc.compile_overridden_regexps(cls, cls.REGEXPNAME_OF)
 
     def __init__(self, workdir: str):
         self.workdir = workdir
@@ -50,9 +66,9 @@ class Venue:
         with open(f"{workdir}/{self.FILENAME}", 'r', encoding='utf8') as f:
             lines = f.readlines()
         for line in lines:
-            mm = re.match(self.ENTRY_REGEXP, line)
+            mm = self.ENTRY_RE.match(line)
             venue, number, citekey_ = (mm.group(1), mm.group(2), mm.group(3))
-            if re.fullmatch(r"20\d\d", number):
+            if self.YEAR_RE.fullmatch(number):
                 number = number[2:]  # remove century, leaving only a two-digit year
             self.venue[citekey_] = venue
             self.volume[citekey_] = f"{venue}{number}"
@@ -78,6 +94,14 @@ class WhoWhat:
     WHOWHAT_FILE = "sample-who-what.txt"  # in workdir
     FILENAMEPATTERN = r"/(.*)?([A-Z])/(\w+)\.txt$"
     BLOCKHEADER_REGEXP = r"^#---+ [Bb]lock (\d+)"
+    FILENAME_RE = re.compile(FILENAMEPATTERN)
+    BLOCKHEADER_RE = re.compile(BLOCKHEADER_REGEXP)
+    REGEXPNAME_OF = dict(FILENAME_RE='FILENAMEPATTERN',  # for icc.compile_overridden_regexps()
+                         BLOCKHEADER_RE='BLOCKHEADER_REGEXP')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        icc.compile_overridden_regexps(cls, cls.REGEXPNAME_OF)
 
     def __init__(self, workdir: str):
         self.workdir = workdir
@@ -85,13 +109,14 @@ class WhoWhat:
         self.coders = set()
         self._coder_of = dict()  # filename -> codername
         self._block_of = dict()  # filename -> blockname
+        self._parts_of = dict()  # filename -> (citekey, coder_letter)
         self._pairs: tg.List[Filepair] = [] 
         with open(f"{workdir}/{self.WHOWHAT_FILE}", 'r', encoding='utf8') as f:
             lines = f.readlines()
         currentblock = ""  # block number as a string
         for line in lines:
             if line.startswith("#"):
-                mm = re.match(self.BLOCKHEADER_REGEXP, line)
+                mm = self.BLOCKHEADER_RE.match(line)
                 if mm:
                     currentblock = mm.group(1)
                 continue
@@ -106,6 +131,7 @@ class WhoWhat:
                 filename = self._implied_filename(citekey_, index)
                 self._coder_of[filename] = coder
                 self._block_of[filename] = currentblock
+                self._parts_of[filename] = (citekey_, self._coder_letter_of(index))
             # --- collect filepair entries, using either _build_pairs_with_A oder _build_neighboring_pairs:
             for next_pair in self._build_pairs_with_A(citekey_, columns):
                 self._pairs.append(next_pair)
@@ -115,9 +141,13 @@ class WhoWhat:
         return self._block_of[filename]
 
     def citekey(self, filename: str) -> str:
+        if filename in self._parts_of:
+            return self._parts_of[filename][0]
         return self._filenamepart(filename, 3)
 
     def coder_letter(self, filename: str) -> str:
+        if filename in self._parts_of:
+            return self._parts_of[filename][1]
         return self._filenamepart(filename, 2)
 
     def files_of(self, coder: str) -> tg.Generator[str, None, None]:
@@ -125,6 +155,10 @@ class WhoWhat:
             if mycoder == coder:
                 yield myfile
 
+    @functools.cached_property
+    def sorted_coders(self) -> tg.List[str]:
+        return sorted(self.coders)
+
     @staticmethod
     def is_reservation(codername: str) -> bool:
         return codername.startswith('-')
@@ -135,14 +169,32 @@ class WhoWhat:
             if not self.is_reservation(coder1) and not self.is_reservation(coder2):
                 yield file1, coder1, file2, coder2
 
+    def pairs_of(self, coder: str) -> tg.List[Filepair]:
+        """The pairs in which coder is one of the two coders."""
+        return self._pairs_by_coder.get(coder, [])
+
+    @functools.cached_property
+    def _pairs_by_coder(self) -> tg.Mapping[str, tg.List[Filepair]]:
+        result = dict()
+        for pair in self.pairs:
+            coder1, coder2 = pair[1], pair[3]
+            result.setdefault(coder1, []).append(pair)
+            if coder2 != coder1:
+                result.setdefault(coder2, []).append(pair)
+        return result
+
     def _implied_filename(self, citekey_: str, columnindex: int) -> str:
         """Knows the abstracts.A, abstracts.B dirname convention. First such column has index 0."""
-        char = chr(ord('A') + columnindex)  # 26 columns maximum (we'll never need more than 10)
+        char = self._coder_letter_of(columnindex)
         return f"{self.workdir}/{self.subdir_prefix}{char}/{citekey_}.txt"
 
+    @staticmethod
+    def _coder_letter_of(columnindex: int) -> str:
+        return chr(ord('A') + columnindex)  # 26 columns maximum (we'll never need more than 10)
+
     def _filenamepart(self, filename: str, which: int) -> str:
-        """Partial inverse of _implied_filename()"""
-        mm = re.search(self.FILENAMEPATTERN, filename)
+        """Partial inverse of _implied_filename(), for files not mentioned in the who/what file"""
+        mm = self.FILENAME_RE.search(filename)
         return mm.group(which)
 
     def _subdir_prefix(self) -> str:
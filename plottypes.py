@@ -10,13 +10,19 @@ import typing as tg
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
+LOWESS_BINS = 1000  # for plot_lowess(maxpoints=...): many more than the plot can resolve
+
 
 class Subset(dict):
     def __getattr__(self, attrname):
         """subset dictionary keys become Python pseudo attributes"""
-        return self[attrname]
+        try:
+            return self[attrname]
+        except KeyError:
+            raise AttributeError(attrname) from None  # so that hasattr(), copy, pickle work
 
 
 class Rows(Subset):
@@ -74,6 +80,7 @@ class PlotContext:
     inner_subsets: tg.Optional[Subsets] = None
     fig: tg.Optional[mpl.figure.Figure] = None
     ax: tg.Optional[mpl.axes.Axes] = None
+    _subframes: tg.Dict[int, pd.DataFrame]  # id(Rows) -> df restricted to these rows, for the current plot
 
     def __init__(self, outputdir, basename, df, height, width,
                  subsets=None, inner_subsets=None):
@@ -86,15 +93,25 @@ class PlotContext:
         figsize = (width, height)
         self.fig = mpl.figure.Figure(figsize=figsize, layout='constrained')
         self.ax = self.fig.add_subplot()
+        self._subframes = dict()
 
     def savefig(self):
         self.fig.savefig(os.path.join(self.outputdir, self.basename + '.pdf'))
 
     def again_for(self, basename: str):
-        """Reuse for another plot: Clear Figure, set a different filename, else the same."""
-        self.fig.clear()
-        self.ax = self.fig.add_subplot()
+        """Reuse for another plot: Clear Axes, set a different filename, else the same."""
+        self.ax.clear()
         self.basename = basename
+        self._subframes.clear()
+
+    def subframe(self, rows: Rows) -> pd.DataFrame:
+        """df restricted to rows. Computed once per plot, as each Rows is combined with many Values."""
+        key = id(rows)  # Subsets are dicts, hence unhashable; they live at least as long as the plot
+        if key not in self._subframes:
+            rows_data: pd.Series = rows.rows_(self.df)
+            assert isinstance(rows_data, pd.Series), type(rows_data)
+            self._subframes[key] = self.df[rows_data.values]
+        return self._subframes[key]
 
 
 AddXletOp = tg.Callable[[PlotContext, float, tg.Any, Subset], None]
@@ -107,8 +124,8 @@ def plot_xletgroups(ctx: PlotContext, add_op: AddXletOp, plottype: str, basename
     ctx.ax.set_ylim(bottom=0, top=ymax)
     ctx.ax.set_ylabel(ylabel)
     ctx.ax.grid(axis='y', linewidth=0.1)
-    inner_x_min = min((sub['x'] for sub in ctx.inner_subsets))
-    inner_x_max = max((sub['x'] for sub in ctx.inner_subsets))
+    inner_xs = [sub['x'] for sub in ctx.inner_subsets]
+    inner_x_min, inner_x_max = min(inner_xs), max(inner_xs)
     inner_width = inner_x_max - inner_x_min
     xticks = []
     for subset in ctx.subsets:
@@ -123,9 +140,7 @@ def add_xletgroup(ctx: PlotContext, x: float, add_xlet_op: AddXletOp, subset: Su
     for inner_subset in ctx.inner_subsets:
         rows = subset if isinstance(subset, Rows) else inner_subset
         values = subset if isinstance(subset, Values) else inner_subset
-        rows_data: pd.Series = rows.rows_(ctx.df)
-        assert isinstance(rows_data, pd.Series), type(rows_data)
-        xlet_data = values.values_(ctx.df[rows_data.values])
+        xlet_data = values.values_(ctx.subframe(rows))
         add_xlet_op(ctx, x, xlet_data, inner_subset)
 
 
@@ -149,14 +164,14 @@ def add_nonzerofractionbarplotlet(ctx: PlotContext, x: float, xlet_data: tg.Any,
     """One bar that shows what fraction (in percent) of the data is nonzero"""
     color = inner_subset.get('color', "mediumblue")
     xlet_x = x + inner_subset['x']
-    y = 100 * ((xlet_data != 0).sum() / len(xlet_data))
+    y = 100 * (np.count_nonzero(xlet_data) / len(xlet_data))
     ctx.ax.bar(x=xlet_x, height=y, width=0.8, label="", color=color)
 
 def add_nonzerofractionbarplotlet_with_errorbars(ctx: PlotContext, x: float, xlet_data: tg.Any, inner_subset: Subset):
     """One bar that shows what fraction (in percent) of the data is nonzero, with error bars"""
     color = inner_subset.get('color', "mediumblue")
     xlet_x = x + inner_subset['x']
-    y = round(100 * ((xlet_data != 0).sum() / len(xlet_data)), 3)
+    y = round(100 * (np.count_nonzero(xlet_data) / len(xlet_data)), 3)
 
     # Error bar calculation
     level1 = xlet_data.index.get_level_values(0)
@@ -178,14 +193,14 @@ def add_zerofractionbarplotlet(ctx: PlotContext, x: float, xlet_data: tg.Any, in
     """One bar that shows what fraction (in percent) of the data is zero"""
     color = inner_subset.get('color', "mediumblue")
     xlet_x = x + inner_subset['x']
-    y = 100 * ((xlet_data == 0).sum() / len(xlet_data))
+    y = 100 * ((len(xlet_data) - np.count_nonzero(xlet_data)) / len(xlet_data))
     ctx.ax.bar(x=xlet_x, height=y, width=0.8, label="", color=color)
 
 def add_zerofractionbarplotlet_with_errorbars(ctx: PlotContext, x: float, xlet_data: tg.Any, inner_subset: Subset):
     """One bar that shows what fraction (in percent) of the data is zero, with error bars"""
     color = inner_subset.get('color', "mediumblue")
     xlet_x = x + inner_subset['x']
-    y = round(100 * ((xlet_data == 0).sum() / len(xlet_data)), 3)
+    y = round(100 * ((len(xlet_data) - np.count_nonzero(xlet_data)) / len(xlet_data)), 3)
 
     # Error bar calculation
     level1 = xlet_data.index.get_level_values(0)
@@ -239,28 +254,51 @@ def add_boxplot(ctx, vals, descr):
 
 def plot_lowess(x: pd.Series, xlabel: str, y: pd.Series, ylabel: str,
                 outputdir: str, name_suffix: str, *, 
-                frac=0.67, show=True, xmax=None, ymax=None):
-    """Plot a scatter plot plus a local linear regression line."""
+                frac=0.67, show=True, xmax=None, ymax=None, maxpoints=None):
+    """
+    Plot a scatter plot plus a local linear regression line.
+    If maxpoints is given and there are more points, the line is only an approximation
+    (but much faster): it smoothes the unweighted x and y means of LOWESS_BINS equal-width x bins,
+    so sparsely populated bins weigh as much as dense ones.
+    """
     # ----- compute lowess line:
     import statsmodels.nonparametric.smoothers_lowess as sml
+    x_arr, y_arr = x.to_numpy(), y.to_numpy()
     delta = 0.01 * (x.max() - x.min())
-    line_xy = sml.lowess(y.to_numpy(), x.to_numpy(), frac=frac, delta=delta,
+    if maxpoints is not None and len(x_arr) > maxpoints:  # lowess runtime grows with the number of points
+        x_fit, y_fit = binned_means(x_arr, y_arr, LOWESS_BINS)
+    else:
+        x_fit, y_fit = x_arr, y_arr
+    line_xy = sml.lowess(y_fit, x_fit, frac=frac, delta=delta,
                          is_sorted=False)
     # ----- plot labeling:
-    plt.figure()
-    plt.xlim(left=0, right=xmax)
-    plt.xlabel(xlabel)
-    plt.ylim(bottom=0, top=ymax)
-    plt.ylabel(ylabel)
-    plt.grid(axis='both', linewidth=0.1)
+    fig = mpl.figure.Figure()  # not plt.figure(), as pyplot would keep every figure alive
+    ax = fig.add_subplot()
+    ax.set_xlim(left=0, right=xmax)
+    ax.set_xlabel(xlabel)
+    ax.set_ylim(bottom=0, top=ymax)
+    ax.set_ylabel(ylabel)
+    ax.grid(axis='both', linewidth=0.1)
     # ----- plot points:
     if show:
-        plt.scatter(x, y, s=2, c="darkred")
+        ax.scatter(x_arr, y_arr, s=2, c="darkred", rasterized=True)  # many points: keep the PDF small
     # ----- plot lowess line:
     # print(line_xy)
-    plt.plot(line_xy[:, 0], line_xy[:, 1], )
+    ax.plot(line_xy[:, 0], line_xy[:, 1], )
     # ----- save:
-    plt.savefig(plotfilename(outputdir, name_suffix=name_suffix))
+    fig.savefig(plotfilename(outputdir, name_suffix=name_suffix), dpi=150)  # dpi of the rasterized points
+
+
+def binned_means(x: np.ndarray, y: np.ndarray, nbins: int) -> tg.Tuple[np.ndarray, np.ndarray]:
+    """Mean x and mean y per equal-width x bin, for non-empty bins only. Non-finite points are dropped."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    bin_idx = np.digitize(x, np.linspace(x.min(), x.max(), nbins))
+    counts = np.bincount(bin_idx)
+    nonempty = counts > 0
+    return (np.bincount(bin_idx, weights=x)[nonempty] / counts[nonempty],
+            np.bincount(bin_idx, weights=y)[nonempty] / counts[nonempty])
 
 
 def funcname(levels_up: int) -> str:
@@ -1,4 +1,7 @@
+import concurrent.futures
+import itertools
 import os.path
+import pathlib
 import re
 import typing as tg
 
@@ -11,6 +14,10 @@ usage = """Prepares files for annotation.
 """
 
 
+possible_end_re = re.compile(r'[.:?!]\s*(?:[ \n]|\Z)')  # sentence end candidate incl. following whitespace
+possible_end_split_re = re.compile(f"({possible_end_re.pattern})")  # split() keeps the ends
+
+
 def configure_argparser(p_prepare_ann):
     p_prepare_ann.add_argument('outputdir',
                                help="Directory where prepared files will be placed")
@@ -19,64 +26,92 @@ def configure_argparser(p_prepare_ann):
 
 
 def prepare_annotations(outputdir: str, inputfiles: tg.Sequence[str]):
-    for inputfile in inputfiles:
-        prepare_one_file(inputfile, outputdir)
+    existing = {direntry.name for direntry in os.scandir(outputdir)}  # one listing instead of a stat per file
+    with concurrent.futures.ThreadPoolExecutor() as executor:  # overlap reading and writing the many files
+        for message in executor.map(write_prepared, inputfiles, itertools.repeat(outputdir),
+                                    itertools.repeat(existing)):
+            print(message)
 
 
 def prepare_one_file(inputfile: str, outputdir: str):
-    with open(inputfile, mode='rt', encoding="utf8") as f:
-        inputstring = f.read()
+    print(write_prepared(inputfile, outputdir))
+
+
+def write_prepared(inputfile: str, outputdir: str, existing: tg.Optional[tg.AbstractSet[str]] = None) -> str:
+    """
+    Write prepared inputfile into outputdir, return a message. Does not print, so it can run in a worker thread.
+    existing, if given, are the names of the files in outputdir.
+    """
     inputfilename = os.path.basename(inputfile)
-    outputpathname = f"{outputdir}/{inputfilename}"
-    if os.path.exists(outputpathname):
-        print(f"#### '{outputpathname}' exists!. SKIPPED.")
-        return
-    print(f"---- writing '{outputpathname}'")
-    with open(outputpathname, mode='wt', encoding="utf8") as f:
-        f.write(prepared(inputstring))
+    outputpathname = os.path.join(outputdir, inputfilename)
+    skipped_msg = f"#### '{outputpathname}' exists!. SKIPPED."
+    already_there = (inputfilename in existing) if existing is not None else os.path.exists(outputpathname)
+    if already_there:
+        return skipped_msg  # without even reading inputfile
+    inputstring = pathlib.Path(inputfile).read_text(encoding="utf8")
+    try:
+        f = open(outputpathname, mode='xb')  # x: atomically fail if created since the check above
+    except FileExistsError:
+        return skipped_msg
+    with f:  # binary: '\n' line ends on all platforms
+        f.writelines(chunk.encode("utf8") for chunk in iter_prepared(inputstring))
+    return f"---- writing '{outputpathname}'"
 
 
 def prepared(txt: str) -> str:
     """
     Splits into sentences and inserts '{{}}' pairs.
     Possible sentence ends are . : ? ! followed by a blank,
-    but instead of a blank there can be '\n' or end-of-file.
+    but instead of a blank there can be '\n' or end-of-file (see possible_end_re).
     Replacements enforce '\n' there and another after the '{{}}'.
     """
-    possible_end = r'[.:?!]\s*[ \n$]'
+    return "".join(iter_prepared(txt))
+
+
+def iter_prepared(txt: str) -> tg.Generator[str, None, None]:
+    """prepared(txt), sentence by sentence, so that it can be written without building it completely."""
+    if not txt:
+        return
     txt2 = with_protection(txt)  # save non-sentence-ends from being treated like sentence ends
-    result = ""
+    if not possible_end_re.search(txt2):
+        yield unprotect(replacement_for(txt2))  # a single sentence only
+        return
     # ----- process abstract text:
-    while len(txt2) > 0:
-        end_match = re.search(possible_end, txt2)
-        if end_match:
-            # print(f"## match ")  #'{end_match.group()}'")
-            endpos = end_match.end()
-            candidate = txt2[0:endpos]
-            txt2 = txt2[endpos:]
-            result += replacement_for(candidate)
-        else:  # no further sentence end at all
-            # print("## remainder ")
-            result += replacement_for(txt2)
-            txt2 = ""
-    return unprotect(result)  # put back protected possible_ends 
+    pieces = possible_end_split_re.split(txt2)  # [sentence, end, sentence, end, ..., remainder]
+    for sentence, end in zip(pieces[0::2], pieces[1::2]):
+        yield unprotect(replacement_for(sentence + end))  # put back protected possible_ends
+    if pieces[-1]:  # remainder without a sentence end
+        yield unprotect(replacement_for(pieces[-1]))
 
 
 protection_replacements = [('.', '\u2059'), (':', '\u205a'), ('?', '\u2056'), ('!', '\u205e'), ]
+protect_table = str.maketrans(dict(protection_replacements))
+unprotect_table = str.maketrans({rplcmnt: char for char, rplcmnt in protection_replacements})
 
 
 def protect(txt: str) -> str:
     """Replace characters that could indicate a sentence end by super-rare ones."""
-    for char, rplcmnt in protection_replacements:
-        txt = txt.replace(char, rplcmnt)
-    return txt
+    return txt.translate(protect_table)
 
 
 def unprotect(txt: str) -> str:
     """Replace the replacement characters back by the original characters."""
-    for char, rplcmnt in protection_replacements:
-        txt = txt.replace(rplcmnt, char)
-    return txt
+    return txt.translate(unprotect_table)
+
+
+non_sentenceends = (  # trailing whitespace is only looked at, so it cannot hide a heading's \n
+    r"[Ee]\.g\.(?=\s)",
+    r"et ?al.(?=\s)",
+    r"https?:(?=\s)",
+    r"[Ii]\.e\.(?=\s)",
+    r"vs\.(?=\s)",
+    r"\n# \d\d?\.?\s.+(?=\n)",  # heading with dotted number or pseudo-end in title
+)
+non_sentenceend_re = re.compile("|".join(f"(?:{regexp})" for regexp in non_sentenceends))  # one pass for all
+non_sentenceend_triggers = (".g.", "et al", "etal", "http", ".e.", "vs.", "\n# ")  # every match contains one
+mark_as_sentence_res = [re.compile(regexp) for regexp in (
+    r"\n(\d\d?\.){0,3}\d\d?\.?\s.+(?=\n)",  # e.g. "2.3.4. Acro: The Design Phase!"
+)]
 
 
 def with_protection(txt: str) -> str:
@@ -84,27 +119,25 @@ def with_protection(txt: str) -> str:
     Knows some kinds of sentence-end-lookalikes that are not really sentence ends
     and protects them by replacing the sentence-end-indicator characters by dummies.
     """
-    non_sentenceends = (r"[Ee]\.g\.\s",
-                        r"et ?al.\s",
-                        r"https?:\s",
-                        r"[Ii]\.e\.\s",
-                        r"vs\.\s",
-                        r"\n# \d\d?\.?\s.+(?=\n)",  # heading with dotted number or pseudo-end in title
-                        )
-    mark_as_sentence = (r"\n(\d\d?\.){0,3}\d\d?\.?\s.+(?=\n)",  # e.g. "2.3.4. Acro: The Design Phase!"
-                        )
     result = txt
-    for non_end in non_sentenceends:
-        result = re.sub(non_end, lambda mm: protect(mm.group()), result)
-    for sentence_structure in mark_as_sentence:
-        result = re.sub(sentence_structure, lambda mm: protect(mm.group()) + ".", result)
+    if any(trigger in txt for trigger in non_sentenceend_triggers):  # cheap pre-check for the regexp
+        result = non_sentenceend_re.sub(_protected_match, result)
+    for sentence_structure_re in mark_as_sentence_res:
+        result = sentence_structure_re.sub(_protected_sentence_match, result)
     return result
 
 
+def _protected_match(mm: re.Match) -> str:
+    return mm.group().translate(protect_table)
+
+
+def _protected_sentence_match(mm: re.Match) -> str:
+    return mm.group().translate(protect_table) + "."
+
+
 def replacement_for(candidate: str) -> str:
     """
     Replaces a sentence by what should appear in the coding file for it:
     replaces the trailing whitespace by "\n{{}}\n".
     """
-    result = re.sub(r"\s*$", r"", candidate)  # remove trailing whitespace
-    return result + "\n{{}}\n"
+    return candidate.rstrip() + "\n{{}}\n"  # rstrip() strips exactly what \s matches
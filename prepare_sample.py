@@ -1,5 +1,7 @@
+import concurrent.futures
 import json
 import os.path
+import pathlib
 import typing as tg
 
 import qscript.extract_part as ep
@@ -17,6 +19,8 @@ def add_arguments(subparser: qscript.ArgumentParser):
                            help="target directory where to to find the volumes directories mentioned in 'sample.list'")
     subparser.add_argument('--remainder', action='store_true', default=False,
                            help="Silently skip existing extracts and create any missing ones.")
+    subparser.add_argument('--jobs', metavar="N", type=int, default=1,
+                           help="number of worker processes for extracting the PDFs (default: 1, i.e. serial)")
 
 
 def execute_template(args: qscript.Namespace, 
@@ -33,12 +37,25 @@ def execute_template(args: qscript.Namespace,
         os.mkdir(targetdir)
     # ----- obtain data:
     sample = metadata.read_list(f'{args.workdir}/sample.list')
+    existing = set(os.listdir(targetdir))  # non-empty only in remaindermode
+    sample = [article for article in sample if f"{metadata.citekey(article)}.txt" not in existing]
     with open(f"{args.workdir}/sample-titles.json", encoding='utf8') as f:
         titles = json.load(f)
     # ----- create coding-input files:
-    for article in sample:
-        prepare_article(extractor, layouttypes, helper,
-                        targetdir, args.volumedir, article, titles)
+    jobs = getattr(args, 'jobs', 1)  # study subcommands may build args without --jobs
+    if jobs <= 1:
+        for article in sample:
+            prepare_article(extractor, layouttypes, helper,
+                            targetdir, args.volumedir, article, titles)
+        return
+    # extractor, layouttypes, and helper must be picklable (e.g. no lambdas) to go to the workers:
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(prepare_article, extractor, layouttypes, helper,
+                                   targetdir, args.volumedir, article,
+                                   {metadata.citekey(article): titles[metadata.citekey(article)]})  # pickle less
+                   for article in sample]
+        for future in futures:
+            future.result()  # re-raise any exception from the workers
 
 
 def prepare_article(extractor: Extractor, layouttypes: tg.Mapping[str, ep.LayoutDescriptor],
@@ -48,7 +65,7 @@ def prepare_article(extractor: Extractor, layouttypes: tg.Mapping[str, ep.Layout
     """Extracts abstract, splits by sentence, inserts {{}}, writes to abstract file"""
     citekey = metadata.citekey(article)
     targetfile = f"{targetdir}/{citekey}.txt"
-    if os.path.exists(targetfile):
+    if os.path.exists(targetfile):  # redundant after execute_template()'s listdir, but not for direct callers
         return  # we are in remaindermode: skip pre-existing file
     # ----- obtain abstract:
     print(f"{article}  \t-> {targetfile}")
@@ -57,6 +74,4 @@ def prepare_article(extractor: Extractor, layouttypes: tg.Mapping[str, ep.Layout
     # ----- annotate extract and write coding-input file:
     title = titles[citekey]
     annotated_txt = qscript.prepare_ann.prepared(txt)
-    with open(targetfile, 'wt', encoding='utf8') as out:
-        out.write(f"{title}\n\n{annotated_txt}")
-        out.write("---\n")
+    pathlib.Path(targetfile).write_text(f"{title}\n\n{annotated_txt}---\n", encoding='utf8')
@@ -0,0 +1,60 @@
+"""Run from the directory above qscript:  python -m unittest discover -s qscript/tests -t ."""
+import os.path
+import tempfile
+import unittest
+
+import qscript.annotations as annot
+import qscript.icc as icc
+
+
+class NoDashAnnotations(annot.Annotations):
+    ANNOTATION_CONTENT_REGEXP = r"(\w+)((?::\w+)*)"  # no dashes in codes
+
+
+class PrefixAnnotations(annot.Annotations):
+    BARE_CODENAME_REGEXP = r"-?(?:[\w]+-)?([\w-]+)(:[\w\d]*)?"  # also strips a prefix such as 'a-'
+
+
+class CodedefCodebook(annot.Codebook):
+    CODEDEF_REGEXP = r"codedef `([\w-]+)((?::[^:`]+)+)?`"
+
+
+class RegexpOverrideTest(unittest.TestCase):
+    """Subclasses (as registered via icc by the study repos) may override the *_REGEXP strings."""
+
+    def setUp(self):
+        icc.register_class(annot.Codebook, annot.Codebook)
+
+    def test_annotation_content_regexp(self):
+        self.assertEqual(annot.Annotations().split_into_codings("{{abc-def, g:i1}}"),
+                         (("abc-def", ""), ("g", ":i1")))
+        self.assertEqual(NoDashAnnotations().split_into_codings("{{abc-def, g:i1}}"),
+                         (("abc", ""), ("def", ""), ("g", ":i1")))
+        self.assertEqual(NoDashAnnotations().codings_of("{{abc-def}}"), {"abc", "def"})
+        self.assertIs(NoDashAnnotations.ANNOTATIONISH_RE, annot.Annotations.ANNOTATIONISH_RE)
+
+    def test_is_empty_annotation(self):
+        annots = annot.Annotations()
+        self.assertTrue(annots.is_empty_annotation("{{ }}"))
+        self.assertTrue(annots.is_empty_annotation("{{}}-and-more"))  # match() checks only the start
+        self.assertFalse(annots.is_empty_annotation("{{a}}"))
+
+    def test_bare_codename_regexp(self):
+        self.assertEqual(annot.Annotations.bare_codename("-a-xyz:i1"), "a-xyz")
+        self.assertEqual(PrefixAnnotations.bare_codename("-a-xyz:i1"), "xyz")
+        self.assertEqual(PrefixAnnotations().bare_codename("a-xyz"), "xyz")
+        self.assertEqual(annot.Annotations().bare_codename("a-xyz"), "a-xyz")  # not PrefixAnnotations' cache entry
+
+    def test_codedef_regexp(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            codebookfile = os.path.join(tmpdir, "codebook.md")
+            with open(codebookfile, 'wt', encoding='utf8') as f:
+                f.write("code `xyz`\nCODEDEF `abc:i1:i2`\n")
+            self.assertEqual(list(annot.Codebook().codebook_contents(codebookfile)), ["xyz"])
+            codedefs = CodedefCodebook().codebook_contents(codebookfile)
+        self.assertEqual(list(codedefs), ["abc"])  # CODEDEF_RE keeps re.IGNORECASE
+        self.assertEqual(codedefs["abc"].suffixdef, "i1:i2")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import os.path
+import tempfile
+import unittest
+
+import qscript.metadata as metadata
+
+
+class DottedVenue(metadata.Venue):
+    ENTRY_REGEXP = r"(\w+)\.(\d+)/([\w-]+)\."  # e.g. TSE.2021/LiuKimBis21.pdf
+
+
+class RegexpOverrideTest(unittest.TestCase):
+    """Subclasses may override the *_REGEXP strings and FILENAMEPATTERN."""
+
+    def test_entry_regexp(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            with open(os.path.join(workdir, metadata.Venue.FILENAME), 'wt', encoding='utf8') as f:
+                f.write("TSE.2021/LiuKimBis21.pdf\n")
+            venue = DottedVenue(workdir)
+        self.assertEqual(venue.venue_of("LiuKimBis21"), "TSE")
+        self.assertEqual(venue.volume_of("LiuKimBis21"), "TSE21")
+
+    def test_whowhat_regexps(self):
+        class MyWhoWhat(metadata.WhoWhat):
+            FILENAMEPATTERN = r"/(.*)?([a-z])/(\w+)\.txt$"
+            BLOCKHEADER_REGEXP = r"^#---+ [Pp]art (\d+)"
+        self.assertEqual(MyWhoWhat.FILENAME_RE.pattern, MyWhoWhat.FILENAMEPATTERN)
+        self.assertEqual(MyWhoWhat.BLOCKHEADER_RE.match("#--- Part 3").group(1), "3")
+        self.assertIsNone(metadata.WhoWhat.BLOCKHEADER_RE.match("#--- Part 3"))
+
+
+if __name__ == '__main__':
+    unittest.main()